@@ -3,14 +3,14 @@ import shutil
 import subprocess
 
 import yaml
-from ebi_eva_common_pyutils import command_utils
 from ebi_eva_common_pyutils.config import cfg
 
 from eva_submission import ROOT_DIR
 from eva_submission.ENA_submission.upload_to_ENA import ENAUploader
 from eva_submission.biosamples_submission import SampleMetadataSubmitter
 from eva_submission.eload_submission import Eload
-from eva_submission.eload_utils import read_md5
+from eva_submission.eload_utils import read_md5, run_command_with_output
+from eva_submission.submission_config import SafeDumper
 from eva_submission.ENA_submission.xlsx_to_ENA_xml import process_metadata_spreadsheet
 
 
@@ -20,8 +20,7 @@ class EloadBrokering(Eload):
 
     def __init__(self, eload_number: int, vcf_files: list = None, metadata_file: str = None):
         super().__init__(eload_number)
-        if 'validation' not in self.eload_cfg:
-            self.eload_cfg['validation'] = {}
+        self.eload_cfg.setdefault('validation', {})
         if vcf_files or metadata_file:
             self.eload_cfg.set('validation', 'valid', value={'Force': True, 'date': self.now})
             if vcf_files:
@@ -51,8 +50,9 @@ class EloadBrokering(Eload):
                                                                                         self._get_dir('ena'), self.eload)
             # Upload the VCF to ENA FTP
             ena_uploader = ENAUploader(self.eload)
-            files_to_upload = [vcf_file for vcf_file in self.eload_cfg['brokering']['vcf_files']] + \
-                              [self.eload_cfg['brokering']['vcf_files'][vcf_file]['index'] for vcf_file in self.eload_cfg['brokering']['vcf_files']]
+            brokered_vcf_files = self.eload_cfg['brokering']['vcf_files']
+            files_to_upload = [vcf_file for vcf_file in brokered_vcf_files] + \
+                              [brokered_vcf_files[vcf_file]['index'] for vcf_file in brokered_vcf_files]
             ena_uploader.upload_vcf_files_to_ena_ftp(files_to_upload)
 
             # Upload XML to ENA
@@ -82,16 +82,16 @@ class EloadBrokering(Eload):
         # run the validation
         brokering_config_file = os.path.join(self.eload_dir, 'brokering_config_file.yaml')
         with open(brokering_config_file, 'w') as open_file:
-            yaml.safe_dump(brokering_config, open_file)
+            yaml.dump(brokering_config, open_file, Dumper=SafeDumper)
         validation_script = os.path.join(ROOT_DIR, 'nextflow', 'prepare_brokering.nf')
         try:
-            command_utils.run_command_with_output(
+            run_command_with_output(
                 'Nextflow brokering preparation process',
-                ' '.join((
+                [
                     cfg['executable']['nextflow'], validation_script,
                     '-params-file', brokering_config_file,
                     '-work-dir', output_dir
-                ))
+                ]
             )
         except subprocess.CalledProcessError as e:
             self.error('Nextflow pipeline failed: aborting brokering')
@@ -1,13 +1,11 @@
 import subprocess
 
-from ebi_eva_common_pyutils import command_utils
+from cached_property import cached_property
 from ebi_eva_common_pyutils.config import cfg
 from ebi_eva_common_pyutils.config_utils import get_pg_metadata_uri_for_eva_profile, get_mongo_uri_for_eva_profile
-from ebi_eva_common_pyutils.pg_utils import get_all_results_for_query
-import psycopg2
-import pymongo
 
 from eva_submission.eload_submission import Eload
+from eva_submission.eload_utils import run_command_with_output
 
 
 class EloadIngestion(Eload):
@@ -19,19 +17,52 @@ class EloadIngestion(Eload):
         self.eload_cfg.set(self.config_section, 'ingestion_date', value=self.now)
         self.settings_xml_file = cfg['maven_settings_file']
 
+    @cached_property
+    def pg_metadata_uri(self):
+        return get_pg_metadata_uri_for_eva_profile("development", self.settings_xml_file)
+
+    @cached_property
+    def mongo_uri(self):
+        return get_mongo_uri_for_eva_profile("production", self.settings_xml_file)
+
+    @cached_property
+    def metadata_connection_handle(self):
+        """Connection to EVAPRO opened on first use and shared across the whole ingestion."""
+        # Imported here so that psycopg2 is not loaded when the database name is provided
+        import psycopg2
+        conn = psycopg2.connect(self.pg_metadata_uri)
+        # Only used for reads: autocommit avoids holding a transaction open while other steps write to the database
+        conn.autocommit = True
+        return conn
+
+    @cached_property
+    def mongo_client(self):
+        """Mongo client created on first use and shared across the whole ingestion."""
+        # Imported here so that importing this module, e.g. for the command line help, does not load pymongo
+        import pymongo
+        return pymongo.MongoClient(self.mongo_uri)
+
+    def close_connections(self):
+        for connection in ('metadata_connection_handle', 'mongo_client'):
+            if connection in self.__dict__:
+                self.__dict__.pop(connection).close()
+
     def ingest(self, db_name=None, tasks=None):
-        # TODO assembly/taxonomy insertion script should be incorporated here
-        self.check_variant_db(db_name)
+        try:
+            # TODO assembly/taxonomy insertion script should be incorporated here
+            self.check_variant_db(db_name)
 
-        if not tasks:
-            tasks = self.all_tasks
+            if not tasks:
+                tasks = self.all_tasks
 
-        if 'metadata_load' in tasks:
-            self.load_from_ena()
-        if 'accession' in tasks:
-            self.warning('Accessioning not yet supported, skipping.')
-        if 'variant_load' in tasks:
-            self.warning('Variant loading not yet supported, skipping.')
+            if 'metadata_load' in tasks:
+                self.load_from_ena()
+            if 'accession' in tasks:
+                self.warning('Accessioning not yet supported, skipping.')
+            if 'variant_load' in tasks:
+                self.warning('Variant loading not yet supported, skipping.')
+        finally:
+            self.close_connections()
 
     def get_db_name(self):
         """
@@ -41,16 +72,16 @@ class EloadIngestion(Eload):
         taxon_id = self.eload_cfg.query('submission', 'taxonomy_id')
 
         # query EVAPRO for db name based on taxonomy id and accession
-        pg_uri = get_pg_metadata_uri_for_eva_profile("development", self.settings_xml_file)
-        with psycopg2.connect(pg_uri) as conn:
-            query = (
-                "SELECT b.taxonomy_code, a.assembly_code "
-                "FROM evapro.assembly a "
-                "JOIN evapro.taxonomy b on b.taxonomy_id = a.taxonomy_id "
-                f"WHERE a.taxonomy_id = '{taxon_id}' "
-                f"AND a.assembly_accession = '{assm_accession}';"
-            )
-            rows = get_all_results_for_query(conn, query)
+        query = (
+            "SELECT b.taxonomy_code, a.assembly_code "
+            "FROM evapro.assembly a "
+            "JOIN evapro.taxonomy b on b.taxonomy_id = a.taxonomy_id "
+            "WHERE a.taxonomy_id = %s "
+            "AND a.assembly_accession = %s;"
+        )
+        with self.metadata_connection_handle.cursor() as cursor:
+            cursor.execute(query, (taxon_id, assm_accession))
+            rows = cursor.fetchall()
         # we should get exactly one result, if not, fail loudly.
         if len(rows) == 0:
             self.error(f'Database for taxonomy id {taxon_id} and assembly {assm_accession} not found in EVAPRO.')
@@ -74,18 +105,17 @@ class EloadIngestion(Eload):
             db_name = self.get_db_name()
         self.eload_cfg.set(self.config_section, 'database', 'db_name', value=db_name)
 
-        mongo_uri = get_mongo_uri_for_eva_profile("production", self.settings_xml_file)
-        with pymongo.MongoClient(mongo_uri) as db:
-            names = db.list_database_names()
-            if db_name in names:
-                self.info(f'Found database named {db_name}.')
-                self.info('If this is incorrect, please cancel and pass in the database name explicitly.')
-                self.eload_cfg.set(self.config_section, 'database', 'exists', value=True)
-            else:
-                self.error(f'Database named {db_name} does not exist in variant warehouse, aborting.')
-                self.error('Please create the database or pass in the appropriate database name explicitly.')
-                self.eload_cfg.set(self.config_section, 'database', 'exists', value=False)
-                raise ValueError(f'No database named {db_name} found.')
+        # Let the server only return the name of the database we are looking for, if it exists
+        matching_databases = list(self.mongo_client.list_databases(filter={'name': db_name}, nameOnly=True))
+        if matching_databases:
+            self.info(f'Found database named {db_name}.')
+            self.info('If this is incorrect, please cancel and pass in the database name explicitly.')
+            self.eload_cfg.set(self.config_section, 'database', 'exists', value=True)
+        else:
+            self.error(f'Database named {db_name} does not exist in variant warehouse, aborting.')
+            self.error('Please create the database or pass in the appropriate database name explicitly.')
+            self.eload_cfg.set(self.config_section, 'database', 'exists', value=False)
+            raise ValueError(f'No database named {db_name} found.')
 
     def load_from_ena(self):
         """
@@ -96,9 +126,9 @@ class EloadIngestion(Eload):
             self.error('No project accession in submission config, check that brokering to ENA is done. ')
             raise ValueError('No project accession in submission config.')
         try:
-            command_utils.run_command_with_output(
+            run_command_with_output(
                 'Load metadata from ENA to EVADEV',
-                ' '.join((
+                [
                     'perl', cfg['executable']['load_from_ena'],
                     '-p', project_accession,
                     # Current submission process never changes -c or -v
@@ -107,7 +137,7 @@ class EloadIngestion(Eload):
                     # -l is only checked for when -c=eva_value_added, so in reality never used
                     '-l', self._get_dir('scratch'),
                     '-e', str(self.eload_num)
-                ))
+                ]
             )
             self.eload_cfg.set(self.config_section, 'ena_load', value='success')
         except subprocess.CalledProcessError as e:
@@ -1,9 +1,8 @@
 #!/usr/bin/env python
-import glob
 import os
 import random
-import shutil
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from cached_property import cached_property
@@ -12,7 +11,7 @@ from ebi_eva_common_pyutils.logger import AppLogger
 from ebi_eva_common_pyutils.taxonomy.taxonomy import get_scientific_name_from_ensembl
 from ebi_eva_common_pyutils.variation.assembly_utils import retrieve_genbank_assembly_accessions_from_ncbi
 
-from eva_submission.eload_utils import get_genome_fasta_and_report
+from eva_submission.eload_utils import get_genome_fasta_and_report, copy_file
 from eva_submission.submission_config import EloadConfig
 from eva_submission.submission_in_ftp import FtpDepositBox
 from eva_submission.xlsx.xlsx_parser_eva import EvaXlsxReader, EvaXlsxWriter
@@ -37,9 +36,10 @@ class Eload(AppLogger):
         self.eload_dir = os.path.abspath(os.path.join(cfg['eloads_dir'], self.eload))
         self.eload_cfg = EloadConfig(os.path.join(self.eload_dir, '.' + self.eload + '_config.yml'))
 
-        os.makedirs(self.eload_dir, exist_ok=True)
-        for k in directory_structure:
-            os.makedirs(self._get_dir(k), exist_ok=True)
+        # Create each directory once with parents first so nested directories do not have to create them again
+        directories = {self.eload_dir}.union(self._get_dir(k) for k in directory_structure)
+        for directory in sorted(directories, key=lambda d: d.count(os.sep)):
+            os.makedirs(directory, exist_ok=True)
 
     def create_nextflow_temp_output_directory(self):
         random_string = ''.join(random.choice(string.ascii_letters) for i in range(6))
@@ -61,14 +61,15 @@ class Eload(AppLogger):
         if len(reader.analysis) == 1:
             single_analysis_alias = reader.analysis[0].get('Analysis Alias')
 
+        sample_name_to_accession = self.eload_cfg.query('brokering', 'Biosamples', 'Samples', ret_default={})
         sample_rows = []
         for sample_row in reader.samples:
-            if self.eload_cfg.query('brokering', 'Biosamples', 'Samples', sample_row.get('Sample Name')):
+            if sample_name_to_accession.get(sample_row.get('Sample Name')):
                 sample_rows.append({
                     'row_num': sample_row.get('row_num'),
                     'Analysis Alias': sample_row.get('Analysis Alias') or single_analysis_alias,
                     'Sample ID': sample_row.get('Sample Name'),
-                    'Sample Accession': self.eload_cfg['brokering']['Biosamples']['Samples'][sample_row.get('Sample Name')]
+                    'Sample Accession': sample_name_to_accession[sample_row.get('Sample Name')]
                 })
             else:
                 sample_rows.append(sample_row)
@@ -78,28 +79,27 @@ class Eload(AppLogger):
         for file_row in reader.files:
             file_to_row[file_row['File Name']] = file_row
 
-        for vcf_file in self.eload_cfg['brokering']['vcf_files']:
-            original_vcf_file = self.eload_cfg['brokering']['vcf_files'][vcf_file]['original_vcf']
-            file_row = file_to_row.get(os.path.basename(original_vcf_file), {})
+        brokered_vcf_files = self.eload_cfg['brokering']['vcf_files']
+        for vcf_file, vcf_file_info in brokered_vcf_files.items():
+            file_row = file_to_row.get(os.path.basename(vcf_file_info['original_vcf']), {})
             # Add the vcf file
             file_rows.append({
                 'Analysis Alias': file_row.get('Analysis Alias') or single_analysis_alias,
                 'File Name': self.eload + '/' + os.path.basename(vcf_file),
                 'File Type': 'vcf',
-                'MD5': self.eload_cfg['brokering']['vcf_files'][vcf_file]['md5']
+                'MD5': vcf_file_info['md5']
             })
 
             # Add the index file
-            if self.eload_cfg['brokering']['vcf_files'][vcf_file]['index'].endswith('.csi'):
+            if vcf_file_info['index'].endswith('.csi'):
                 file_type = 'csi'
             else:
                 file_type = 'tabix'
             file_rows.append({
                 'Analysis Alias': file_row.get('Analysis Alias') or single_analysis_alias,
-                'File Name': self.eload + '/' + os.path.basename(
-                    self.eload_cfg['brokering']['vcf_files'][vcf_file]['index']),
+                'File Name': self.eload + '/' + os.path.basename(vcf_file_info['index']),
                 'File Type': file_type,
-                'MD5': self.eload_cfg['brokering']['vcf_files'][vcf_file]['index_md5']
+                'MD5': vcf_file_info['index_md5']
             })
         if output_spreadsheet:
             eva_xls_writer = EvaXlsxWriter(input_spreadsheet, output_spreadsheet)
@@ -113,23 +113,30 @@ class Eload(AppLogger):
 
 class EloadPreparation(Eload):
 
+    max_workers = 8  # maximum number of files copied concurrently
+
     def copy_from_ftp(self, ftp_box, submitter):
         box = FtpDepositBox(ftp_box, submitter)
 
+        files_to_copy = []
         vcf_dir = os.path.join(self.eload_dir, directory_structure['vcf'])
         for vcf_file in box.vcf_files:
-            dest = os.path.join(vcf_dir, os.path.basename(vcf_file))
-            shutil.copyfile(vcf_file, dest)
+            files_to_copy.append((vcf_file, os.path.join(vcf_dir, os.path.basename(vcf_file))))
 
         if box.most_recent_metadata:
             if len(box.metadata_files) != 1:
                 self.warning('Found %s metadata file in the FTP. Will use the most recent one', len(box.metadata_files))
             metadata_dir = os.path.join(self.eload_dir, directory_structure['metadata'])
             dest = os.path.join(metadata_dir, os.path.basename(box.most_recent_metadata))
-            shutil.copyfile(box.most_recent_metadata, dest)
+            files_to_copy.append((box.most_recent_metadata, dest))
         else:
             self.error('No metadata file in the FTP: %s', box.deposit_box)
 
+        # Copies are I/O bound and independent so they can overlap
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(copy_file, source, dest) for source, dest in files_to_copy]:
+                future.result()
+
         for other_file in box.other_files:
             self.warning('File %s will not be treated', other_file)
 
@@ -139,9 +146,18 @@ class EloadPreparation(Eload):
         self.detect_metadata_attributes()
         self.find_genome()
 
+    @staticmethod
+    def _find_files_with_extensions(directory, *extensions):
+        """List the non-hidden files of a directory ending with any of the extensions in a single scan."""
+        with os.scandir(directory) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.is_file() and not entry.name.startswith('.') and entry.name.endswith(extensions)
+            ]
+
     def detect_submitted_metadata(self):
         metadata_dir = os.path.join(self.eload_dir, directory_structure['metadata'])
-        metadata_spreadsheets = glob.glob(os.path.join(metadata_dir, '*.xlsx'))
+        metadata_spreadsheets = self._find_files_with_extensions(metadata_dir, '.xlsx')
         if len(metadata_spreadsheets) != 1:
             self.critical('Found %s spreadsheet in %s', len(metadata_spreadsheets), metadata_dir)
             raise ValueError('Found %s spreadsheet in %s'% (len(metadata_spreadsheets), metadata_dir))
@@ -149,19 +165,26 @@ class EloadPreparation(Eload):
 
     def detect_submitted_vcf(self):
         vcf_dir = os.path.join(self.eload_dir, directory_structure['vcf'])
-        uncompressed_vcf = glob.glob(os.path.join(vcf_dir, '*.vcf'))
-        compressed_vcf = glob.glob(os.path.join(vcf_dir, '*.vcf.gz'))
-        vcf_files = uncompressed_vcf + compressed_vcf
+        vcf_files = self._find_files_with_extensions(vcf_dir, '.vcf', '.vcf.gz')
         if len(vcf_files) < 1:
             raise FileNotFoundError('Could not locate vcf file in in %s', vcf_dir)
         self.eload_cfg.set('submission','vcf_files', value=vcf_files)
 
     def detect_metadata_attributes(self):
         eva_metadata = EvaXlsxReader(self.eload_cfg.query('submission', 'metadata_spreadsheet'))
-        reference_gca = set()
-        for analysis in eva_metadata.analysis:
-            reference_txt = analysis.get('Reference')
-            reference_gca.update(retrieve_genbank_assembly_accessions_from_ncbi(reference_txt))
+        references = [analysis.get('Reference') for analysis in eva_metadata.analysis]
+        taxonomy_id = eva_metadata.project.get('Tax ID')
+        valid_taxonomy_id = taxonomy_id and (isinstance(taxonomy_id, int) or taxonomy_id.isdigit())
+
+        # The species lookup runs in the background while the assembly lookups stay sequential: NCBI eutils allows
+        # 3 requests per second without API key and a rate limited response looks like a reference that does not resolve
+        scientific_name_future = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            if valid_taxonomy_id:
+                scientific_name_future = executor.submit(get_scientific_name_from_ensembl, taxonomy_id)
+            reference_gca = set()
+            for reference_txt in set(references):
+                reference_gca.update(retrieve_genbank_assembly_accessions_from_ncbi(reference_txt))
 
         if len(reference_gca) > 1:
             self.warning('Multiple assemblies in project: %s', ', '.join(reference_gca))
@@ -171,13 +194,11 @@ class EloadPreparation(Eload):
         if reference_gca:
             self.eload_cfg.set('submission', 'assembly_accession', value=reference_gca.pop())
         else:
-            self.error('No genbank accession could be found for %s', reference_txt)
+            self.error('No genbank accession could be found for %s', ', '.join(str(r) for r in references))
 
-        taxonomy_id = eva_metadata.project.get('Tax ID')
-        if taxonomy_id and (isinstance(taxonomy_id, int) or taxonomy_id.isdigit()):
+        if valid_taxonomy_id:
             self.eload_cfg.set('submission', 'taxonomy_id', value=int(taxonomy_id))
-            scientific_name = get_scientific_name_from_ensembl(taxonomy_id)
-            self.eload_cfg.set('submission', 'scientific_name', value=scientific_name)
+            self.eload_cfg.set('submission', 'scientific_name', value=scientific_name_future.result())
         else:
             if taxonomy_id:
                 self.error('Taxonomy id %s is invalid:', taxonomy_id)
@@ -1,5 +1,8 @@
-import glob
+import fcntl
 import os
+import selectors
+import shutil
+import subprocess
 
 from ebi_eva_common_pyutils.assembly import NCBIAssembly
 from ebi_eva_common_pyutils.config import cfg
@@ -7,6 +10,9 @@ from ebi_eva_common_pyutils.logger import logging_config as log_cfg
 
 logger = log_cfg.get_logger(__name__)
 
+# ioctl request number used to create a copy-on-write clone of a file (see linux/fs.h)
+FICLONE = 0x40049409
+
 
 def get_genome_fasta_and_report(species_name, assembly_accession, output_directory=None, overwrite=False):
     output_directory = output_directory or cfg.query('genome_downloader', 'output_directory')
@@ -19,12 +25,33 @@ def get_genome_fasta_and_report(species_name, assembly_accession, output_directo
     return assembly.assembly_fasta_path, assembly.assembly_report_path
 
 
-def resolve_single_file_path(file_path):
-    files = glob.glob(file_path)
-    if len(files) == 0:
-        return None
-    elif len(files) > 0:
-        return files[0]
+def copy_file(source, dest):
+    """
+    Copy the content of source to dest.
+    A copy-on-write clone is attempted first, which is a metadata only operation on filesystems supporting reflinks
+    (btrfs, XFS). Otherwise the content is copied with sendfile so the data stays in kernel space, and falls back to
+    shutil.copyfile on platforms where sendfile does not support regular files.
+    """
+    try:
+        with open(source, 'rb') as open_source, open(dest, 'wb') as open_dest:
+            try:
+                fcntl.ioctl(open_dest.fileno(), FICLONE, open_source.fileno())
+                return dest
+            except OSError:
+                logger.debug('Could not clone %s to %s: copying the content', source, dest)
+            if hasattr(os, 'posix_fadvise'):
+                # The source is read once from start to end: let the kernel use a larger read-ahead
+                os.posix_fadvise(open_source.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            size = os.fstat(open_source.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(open_dest.fileno(), open_source.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+    except (AttributeError, OSError):
+        shutil.copyfile(source, dest)
+    return dest
 
 
 def read_md5(md5_file):
@@ -42,3 +69,43 @@ def get_file_content(file_path):
     with open(file_path, 'rb') as f:
         fc = f.read()
     return fc
+
+
+def _log_process_output(process, chunk_size=65536):
+    """
+    Log the output of a running process: stdout at info level and stderr at error level.
+    Both pipes are drained in large chunks as soon as data is available so that neither can fill up and block the
+    process, and the interpreter wakes up once per chunk rather than once per line.
+    """
+    log_functions = {process.stdout: logger.info, process.stderr: logger.error}
+    partial_lines = {process.stdout: b'', process.stderr: b''}
+    with selectors.DefaultSelector() as selector:
+        for stream in log_functions:
+            selector.register(stream, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                stream = key.fileobj
+                chunk = os.read(stream.fileno(), chunk_size)
+                if chunk:
+                    *lines, partial_lines[stream] = (partial_lines[stream] + chunk).split(b'\n')
+                else:
+                    selector.unregister(stream)
+                    lines = [partial_lines[stream]] if partial_lines[stream] else []
+                for line in lines:
+                    log_functions[stream](line.decode(errors='replace').rstrip())
+
+
+def run_command_with_output(command_description, command, env=None):
+    """
+    Run a command provided as a list of arguments without going through a shell and log its output.
+    This mirrors ebi_eva_common_pyutils.command_utils.run_command_with_output but accepts an environment for the
+    process instead of relying on shell exports.
+    """
+    logger.info('Starting process: ' + command_description)
+    logger.info('Running command: ' + ' '.join(command))
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env) as process:
+        _log_process_output(process)
+    if process.returncode != 0:
+        logger.error(command_description + ' failed! Refer to the error messages for details.')
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+    logger.info(command_description + ' - completed successfully')
@@ -1,16 +1,18 @@
 #!/usr/bin/env python
+import fnmatch
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
-from ebi_eva_common_pyutils import command_utils
 from ebi_eva_common_pyutils.config import cfg
 
 from eva_submission import ROOT_DIR
 from eva_submission.eload_submission import Eload
-from eva_submission.eload_utils import resolve_single_file_path
+from eva_submission.eload_utils import run_command_with_output
 from eva_submission.samples_checker import compare_spreadsheet_and_vcf
+from eva_submission.submission_config import SafeDumper
 from eva_submission.xlsx.xlsx_validation import EvaXlsxValidator
 
 
@@ -28,15 +30,28 @@ class EloadValidation(Eload):
         for validation_task in validation_tasks:
             self.eload_cfg.set('validation', validation_task, value={})
 
-        if 'metadata_check' in validation_tasks:
-            self._validate_metadata_format()
-        if 'sample_check' in validation_tasks:
-            self._validate_sample_names()
-
-        if 'vcf_check' in validation_tasks or 'assembly_check' in validation_tasks:
-            output_dir = self._run_validation_workflow()
+        # The Nextflow workflow runs in a separate process so the other checks can happen while it is running.
+        # Leaving the executor waits for every task: a failing check is only raised once the workflow has finished.
+        futures = []
+        workflow_future = None
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            if 'metadata_check' in validation_tasks:
+                futures.append(executor.submit(self._validate_metadata_format))
+            if 'sample_check' in validation_tasks:
+                futures.append(executor.submit(self._validate_sample_names))
+            if 'vcf_check' in validation_tasks or 'assembly_check' in validation_tasks:
+                workflow_future = executor.submit(self._run_validation_workflow)
+
+        # Keep the workflow results even if one of the other checks failed
+        if workflow_future and not workflow_future.exception():
+            output_dir = workflow_future.result()
             self._collect_validation_worklflow_results(output_dir)
             shutil.rmtree(output_dir)
+        # Then raise any error from the checks or from the workflow itself
+        for future in futures:
+            future.result()
+        if workflow_future:
+            workflow_future.result()
 
         if set_as_valid is True:
             for validation_task in validation_tasks:
@@ -124,17 +139,17 @@ class EloadValidation(Eload):
         # run the validation
         validation_confg_file = os.path.join(self.eload_dir, 'validation_confg_file.yaml')
         with open(validation_confg_file, 'w') as open_file:
-            yaml.safe_dump(validation_config, open_file)
+            yaml.dump(validation_config, open_file, Dumper=SafeDumper)
         validation_script = os.path.join(ROOT_DIR, 'nextflow', 'validation.nf')
         try:
-            command_utils.run_command_with_output(
+            run_command_with_output(
                 'Nextflow Validation process',
-                ' '.join((
-                    'export NXF_OPTS="-Xms1g -Xmx8g"; ',
+                [
                     cfg['executable']['nextflow'], validation_script,
                     '-params-file', validation_confg_file,
                     '-work-dir', output_dir
-                ))
+                ],
+                env=dict(os.environ, NXF_OPTS='-Xms1g -Xmx8g')
             )
         except subprocess.CalledProcessError:
             self.error('Nextflow pipeline failed: results might not be complete')
@@ -148,21 +163,45 @@ class EloadValidation(Eload):
         else:
             return None
 
+    @staticmethod
+    def _list_files(directory):
+        if os.path.isdir(directory):
+            return os.listdir(directory)
+        return []
+
+    @staticmethod
+    def _resolve_single_file_in(directory, file_names, pattern):
+        """
+        Find the first of the file names listed from directory that matches the pattern.
+        The match is removed from file_names as it is expected to be moved afterwards.
+        """
+        matches = fnmatch.filter(file_names, pattern)
+        if matches:
+            file_names.remove(matches[0])
+            return os.path.join(directory, matches[0])
+        return None
+
     def _collect_validation_worklflow_results(self, output_dir):
         # Collect information from the output and summarise in the config
+        # Each output directory is listed once rather than searched for every expected file
+        vcf_format_dir = os.path.join(output_dir, 'vcf_format')
+        vcf_format_files = self._list_files(vcf_format_dir)
+        assembly_check_dir = os.path.join(output_dir, 'assembly_check')
+        assembly_check_files = self._list_files(assembly_check_dir)
+
         total_error = 0
         # detect output files for vcf check
         for vcf_file in self.eload_cfg.query('submission', 'vcf_files'):
             vcf_name = os.path.basename(vcf_file)
 
-            tmp_vcf_check_log = resolve_single_file_path(
-                os.path.join(output_dir, 'vcf_format', vcf_name + '.vcf_format.log')
+            tmp_vcf_check_log = self._resolve_single_file_in(
+                vcf_format_dir, vcf_format_files, vcf_name + '.vcf_format.log'
             )
-            tmp_vcf_check_text_report = resolve_single_file_path(
-                os.path.join(output_dir, 'vcf_format', vcf_name + '.*.txt')
+            tmp_vcf_check_text_report = self._resolve_single_file_in(
+                vcf_format_dir, vcf_format_files, vcf_name + '.*.txt'
             )
-            tmp_vcf_check_db_report = resolve_single_file_path(
-                os.path.join(output_dir, 'vcf_format', vcf_name + '.*.db')
+            tmp_vcf_check_db_report = self._resolve_single_file_in(
+                vcf_format_dir, vcf_format_files, vcf_name + '.*.db'
             )
 
             # move the output files
@@ -196,14 +235,14 @@ class EloadValidation(Eload):
         for vcf_file in self.eload_cfg.query('submission', 'vcf_files'):
             vcf_name = os.path.basename(vcf_file)
 
-            tmp_assembly_check_log = resolve_single_file_path(
-                os.path.join(output_dir, 'assembly_check',  vcf_name + '.assembly_check.log')
+            tmp_assembly_check_log = self._resolve_single_file_in(
+                assembly_check_dir, assembly_check_files, vcf_name + '.assembly_check.log'
             )
-            tmp_assembly_check_valid_vcf = resolve_single_file_path(
-                os.path.join(output_dir, 'assembly_check', vcf_name + '.valid_assembly_report*')
+            tmp_assembly_check_valid_vcf = self._resolve_single_file_in(
+                assembly_check_dir, assembly_check_files, vcf_name + '.valid_assembly_report*'
             )
-            tmp_assembly_check_text_report = resolve_single_file_path(
-                os.path.join(output_dir, 'assembly_check', vcf_name + '*text_assembly_report*')
+            tmp_assembly_check_text_report = self._resolve_single_file_in(
+                assembly_check_dir, assembly_check_files, vcf_name + '*text_assembly_report*'
             )
 
             # move the output files
@@ -1,9 +1,16 @@
 #!/usr/bin/env python
 import os
+import shutil
 
 import yaml
 from ebi_eva_common_pyutils.config import Configuration, cfg
 
+try:
+    # libyaml based dumper, much faster than the pure python one when PyYAML was built with it
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 
 class EloadConfig(Configuration):
     """Configuration object that allows write to the config file"""
@@ -19,17 +26,38 @@ class EloadConfig(Configuration):
 
     def write(self):
         if self.config_file and self.content and os.path.isdir(os.path.dirname(self.config_file)):
-            with open(self.config_file, 'w') as open_config:
-                yaml.safe_dump(self.content, open_config)
+            # Write to a temporary file then rename it so that a crash cannot leave a truncated config behind
+            tmp_config_file = self.config_file + '.tmp'
+            with open(tmp_config_file, 'w') as open_config:
+                yaml.dump(self.content, open_config, Dumper=SafeDumper)
+                open_config.flush()
+                os.fsync(open_config.fileno())
+            if os.path.exists(self.config_file):
+                self._copy_permissions(self.config_file, tmp_config_file)
+            os.replace(tmp_config_file, self.config_file)
+
+    @staticmethod
+    def _copy_permissions(source, dest):
+        """Keep mode and group of the config being replaced as submission directories are shared across the team."""
+        shutil.copymode(source, dest)
+        source_gid = os.stat(source).st_gid
+        if os.stat(dest).st_gid != source_gid:
+            try:
+                os.chown(dest, -1, source_gid)
+            except PermissionError:
+                # Changing the group requires being a member of it: otherwise keep the default group
+                pass
 
     def set(self, *path, value):
         top_level = self.content
         for p in path[:-1]:
-            if p not in top_level:
-                top_level[p] = {}
-            top_level = top_level[p]
+            top_level = top_level.setdefault(p, {})
         top_level[path[-1]] = value
 
+    def setdefault(self, item, default=None):
+        """Allow dict-style setdefault on the first layer of the config, e.g. config.setdefault('this', {})."""
+        return self.content.setdefault(item, default)
+
     def __setitem__(self, item, value):
         """Allow dict-style write access, e.g. config['this']='that'."""
         self.content[item] = value
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import yaml
 from cerberus import Validator
@@ -13,6 +14,10 @@ from eva_submission.xlsx.xlsx_parser_eva import EvaXlsxReader
 
 class EvaXlsxValidator(AppLogger):
 
+    max_workers = 8  # maximum number of concurrent Ensembl lookups during the semantic validation
+    # NCBI eutils allows 3 requests per second without API key and each assembly lookup makes 2 requests
+    max_ncbi_workers = 1
+
     def __init__(self, metadata_file):
         self.metadata_file = metadata_file
         self.reader = EvaXlsxReader(metadata_file)
@@ -75,20 +80,34 @@ class EvaXlsxValidator(AppLogger):
         Validation of the data that involve checking its meaning
         This function adds error statements to the errors attribute
         """
-        # Check if the references can be retrieved
         references = set([row['Reference'] for row in self.metadata['Analysis'] if row['Reference']])
-        for reference in references:
-            accessions = retrieve_genbank_assembly_accessions_from_ncbi(reference)
+        taxid_and_species_list = set([(row['Tax Id'], row['Scientific Name']) for row in self.metadata['Sample'] if row['Tax Id']])
+        # The remote lookups are independent from each other so they are run concurrently, NCBI ones being limited
+        # to its rate limit as a rate limited response would look like a reference that does not resolve
+        with ThreadPoolExecutor(max_workers=self.max_ncbi_workers) as ncbi_executor, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as ensembl_executor:
+            reference_futures = [
+                (reference, ncbi_executor.submit(retrieve_genbank_assembly_accessions_from_ncbi, reference))
+                for reference in references
+            ]
+            taxonomy_futures = [
+                # int conversion happens in the worker so that invalid taxonomy ids are reported like lookup errors
+                (taxid, species, ensembl_executor.submit(lambda t: get_scientific_name_from_ensembl(int(t)), taxid))
+                for taxid, species in taxid_and_species_list
+            ]
+
+        # Check if the references can be retrieved
+        for reference, future in reference_futures:
+            accessions = future.result()
             if len(accessions) == 0:
                 self.error_list.append(f'In Analysis, Reference {reference} did not resolve to any accession')
             elif len(accessions) > 1:
                 self.error_list.append(f'In Analysis, Reference {reference} resolve to more than one accession: {accessions}')
 
         # Check taxonomy scientific name pair
-        taxid_and_species_list = set([(row['Tax Id'], row['Scientific Name']) for row in self.metadata['Sample'] if row['Tax Id']])
-        for taxid, species in taxid_and_species_list:
+        for taxid, species, future in taxonomy_futures:
             try:
-                scientific_name = get_scientific_name_from_ensembl(int(taxid))
+                scientific_name = future.result()
                 if species != scientific_name:
                     self.error_list.append(
                         f'In Samples, Taxonomy {taxid} and scientific name {species} are inconsistent')
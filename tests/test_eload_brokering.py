@@ -37,12 +37,12 @@ class TestEloadBrokering(TestCase):
         nf_script = os.path.join(ROOT_DIR, 'nextflow', 'prepare_brokering.nf')
         config_file = os.path.join(self.eload.eload_dir, 'brokering_config_file.yaml')
 
-        with patch('eva_submission.eload_brokering.command_utils.run_command_with_output') as m_execute, \
+        with patch('eva_submission.eload_brokering.run_command_with_output') as m_execute, \
                 patch.object(Eload, 'create_nextflow_temp_output_directory', return_value=temp_dir):
             self.eload._run_brokering_prep_workflow()
         m_execute.assert_called_once_with(
             'Nextflow brokering preparation process',
-            f'path_to_nextflow {nf_script} -params-file {config_file} -work-dir {temp_dir}'
+            ['path_to_nextflow', nf_script, '-params-file', config_file, '-work-dir', temp_dir]
         )
 
     def test_collect_brokering_workflow_results(self):
@@ -1,5 +1,9 @@
+import os
+import tempfile
 from unittest import TestCase
 
+import yaml
+
 from eva_submission.submission_config import EloadConfig
 
 
@@ -13,3 +17,34 @@ class TestEloadConfig(TestCase):
         eload_cfg.set('level1', 'level2', 'level3', value='Value2')
         assert eload_cfg.content['level1']['level2']['level3'] == 'Value2'
 
+    def test_setdefault(self):
+        eload_cfg = EloadConfig()
+        eload_cfg.content = {'key': 'Value1'}
+        assert eload_cfg.setdefault('key', 'Value2') == 'Value1'
+        assert eload_cfg.setdefault('level1', {}) == {}
+        eload_cfg.setdefault('level1', {})['level2'] = 'Value3'
+        assert eload_cfg.content == {'key': 'Value1', 'level1': {'level2': 'Value3'}}
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = os.path.join(tmp_dir, '.ELOAD_1_config.yml')
+            eload_cfg = EloadConfig(config_file)
+            eload_cfg.content = {}
+            eload_cfg.set('level1', 'level2', value='Value1')
+            eload_cfg.write()
+            assert os.listdir(tmp_dir) == ['.ELOAD_1_config.yml']
+            with open(config_file) as open_file:
+                assert yaml.safe_load(open_file) == {'level1': {'level2': 'Value1'}}
+
+    def test_write_keeps_permissions(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = os.path.join(tmp_dir, '.ELOAD_1_config.yml')
+            with open(config_file, 'w') as open_file:
+                open_file.write('key: Value1\n')
+            os.chmod(config_file, 0o664)
+            eload_cfg = EloadConfig(config_file)
+            eload_cfg.set('key', value='Value2')
+            eload_cfg.write()
+            assert os.stat(config_file).st_mode & 0o777 == 0o664
+            with open(config_file) as open_file:
+                assert yaml.safe_load(open_file) == {'key': 'Value2'}
@@ -35,44 +35,57 @@ class TestEloadIngestion(TestCase):
             shutil.rmtree(eload)
 
     def _mock_mongodb_client(self):
-        m_db = mock.Mock()
-        m_db.list_database_names = mock.Mock(return_value=[
-            'eva_ecaballus_30',
-            'eva_hsapiens_grch38'
-        ])
-        return m_db
+        database_names = ['eva_ecaballus_30', 'eva_hsapiens_grch38']
+        m_client = mock.Mock()
+        m_client.list_databases = mock.Mock(side_effect=lambda filter, nameOnly: iter(
+            [{'name': name} for name in database_names if name == filter['name']]
+        ))
+        return m_client
+
+    @staticmethod
+    def _mock_pg_cursor(m_connect):
+        return m_connect.return_value.cursor.return_value.__enter__.return_value
 
     def test_get_db_name(self):
+        self.eload.eload_cfg.set('submission', 'taxonomy_id', value=9796)
         with patch('eva_submission.eload_ingestion.get_pg_metadata_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.psycopg2.connect', autospec=True), \
-                patch('eva_submission.eload_ingestion.get_all_results_for_query') as m_get_query_results:
-            m_get_query_results.return_value = [('ecaballus', '30')]
+                patch('psycopg2.connect', autospec=True) as m_connect:
+            self._mock_pg_cursor(m_connect).fetchall.return_value = [('ecaballus', '30')]
             self.assertEqual('eva_ecaballus_30', self.eload.get_db_name())
+            self._mock_pg_cursor(m_connect).execute.assert_called_once_with(mock.ANY, (9796, 'GCA_002863925.1'))
 
     def test_get_db_name_missing_evapro(self):
         with patch('eva_submission.eload_ingestion.get_pg_metadata_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.psycopg2.connect', autospec=True), \
-                patch('eva_submission.eload_ingestion.get_all_results_for_query') as m_get_query_results:
-            m_get_query_results.return_value = []
+                patch('psycopg2.connect', autospec=True) as m_connect:
+            self._mock_pg_cursor(m_connect).fetchall.return_value = []
             with self.assertRaises(ValueError):
                 self.eload.get_db_name()
 
     def test_get_db_name_multiple_evapro(self):
         with patch('eva_submission.eload_ingestion.get_pg_metadata_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.psycopg2.connect', autospec=True), \
-                patch('eva_submission.eload_ingestion.get_all_results_for_query') as m_get_query_results:
-            m_get_query_results.return_value = [('ecaballus', '30'), ('ecaballus', '20')]
+                patch('psycopg2.connect', autospec=True) as m_connect:
+            self._mock_pg_cursor(m_connect).fetchall.return_value = [('ecaballus', '30'), ('ecaballus', '20')]
             with self.assertRaises(ValueError):
                 self.eload.get_db_name()
 
+    def test_metadata_connection_reused(self):
+        with patch('eva_submission.eload_ingestion.get_pg_metadata_uri_for_eva_profile', autospec=True), \
+                patch('psycopg2.connect', autospec=True) as m_connect:
+            self._mock_pg_cursor(m_connect).fetchall.return_value = [('ecaballus', '30')]
+            self.eload.get_db_name()
+            self.eload.get_db_name()
+            m_connect.assert_called_once()
+            assert m_connect.return_value.autocommit is True
+            self.eload.close_connections()
+            m_connect.return_value.close.assert_called_once()
+
     def test_check_variant_db(self):
         with patch('eva_submission.eload_ingestion.get_pg_metadata_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.psycopg2.connect', autospec=True), \
-                patch('eva_submission.eload_ingestion.get_all_results_for_query') as m_get_results, \
+                patch('psycopg2.connect', autospec=True) as m_connect, \
                 patch('eva_submission.eload_ingestion.get_mongo_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.pymongo.MongoClient', autospec=True) as m_get_mongo:
-            m_get_results.return_value = [('ecaballus', '30')]
-            m_get_mongo.return_value.__enter__.return_value = self._mock_mongodb_client()
+                patch('pymongo.MongoClient', autospec=True) as m_get_mongo:
+            self._mock_pg_cursor(m_connect).fetchall.return_value = [('ecaballus', '30')]
+            m_get_mongo.return_value = self._mock_mongodb_client()
 
             self.eload.check_variant_db()
             self.assertEqual(
@@ -83,8 +96,8 @@ class TestEloadIngestion(TestCase):
 
     def test_check_variant_db_name_provided(self):
         with patch('eva_submission.eload_ingestion.get_mongo_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.pymongo.MongoClient', autospec=True) as m_get_mongo:
-            m_get_mongo.return_value.__enter__.return_value = self._mock_mongodb_client()
+                patch('pymongo.MongoClient', autospec=True) as m_get_mongo:
+            m_get_mongo.return_value = self._mock_mongodb_client()
             self.eload.check_variant_db(db_name='eva_hsapiens_grch38')
             self.assertEqual(
                 self.eload.eload_cfg.query('ingestion', 'database', 'db_name'),
@@ -92,10 +105,19 @@ class TestEloadIngestion(TestCase):
             )
             assert self.eload.eload_cfg.query('ingestion', 'database', 'exists')
 
+    def test_check_variant_db_settings_parsed_once(self):
+        with patch('eva_submission.eload_ingestion.get_mongo_uri_for_eva_profile', autospec=True) as m_get_uri, \
+                patch('pymongo.MongoClient', autospec=True) as m_get_mongo:
+            m_get_mongo.return_value = self._mock_mongodb_client()
+            self.eload.check_variant_db(db_name='eva_hsapiens_grch38')
+            self.eload.check_variant_db(db_name='eva_ecaballus_30')
+            m_get_uri.assert_called_once()
+            m_get_mongo.assert_called_once()
+
     def test_check_variant_db_missing(self):
         with patch('eva_submission.eload_ingestion.get_mongo_uri_for_eva_profile', autospec=True), \
-                patch('eva_submission.eload_ingestion.pymongo.MongoClient', autospec=True) as m_get_mongo:
-            m_get_mongo.return_value.__enter__.return_value = self._mock_mongodb_client()
+                patch('pymongo.MongoClient', autospec=True) as m_get_mongo:
+            m_get_mongo.return_value = self._mock_mongodb_client()
 
             with self.assertRaises(ValueError):
                 self.eload.check_variant_db(db_name='eva_fcatus_90')
@@ -106,7 +128,7 @@ class TestEloadIngestion(TestCase):
             assert not self.eload.eload_cfg.query('ingestion', 'database', 'exists')
 
     def test_load_from_ena(self):
-        with patch('eva_submission.eload_ingestion.command_utils.run_command_with_output', autospec=True) as m_execute:
+        with patch('eva_submission.eload_ingestion.run_command_with_output', autospec=True) as m_execute:
             self.eload.load_from_ena()
             m_execute.assert_called_once()
 
@@ -116,7 +138,7 @@ class TestEloadIngestion(TestCase):
             self.eload.load_from_ena()
 
     def test_load_from_ena_script_fails(self):
-        with patch('eva_submission.eload_ingestion.command_utils.run_command_with_output', autospec=True) as m_execute:
+        with patch('eva_submission.eload_ingestion.run_command_with_output', autospec=True) as m_execute:
             m_execute.side_effect = subprocess.CalledProcessError(1, 'some command')
             with self.assertRaises(subprocess.CalledProcessError):
                 self.eload.load_from_ena()
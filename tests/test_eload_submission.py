@@ -2,10 +2,12 @@ import glob
 import os
 import shutil
 from unittest import TestCase
+from unittest.mock import patch
 
 from eva_submission import ROOT_DIR
 from eva_submission.eload_submission import EloadPreparation
 from eva_submission.submission_config import load_config
+from eva_submission.xlsx.xlsx_parser_eva import EvaXlsxReader
 
 
 def touch(filepath, content=None):
@@ -46,6 +48,9 @@ class TestEload(TestCase):
         vcf2 = os.path.join(eload.eload_dir, '10_submitted', 'vcf_files', 'file2.vcf')
         touch(vcf1)
         touch(vcf2)
+        # Neither the index nor the hidden file should be detected
+        touch(os.path.join(eload.eload_dir, '10_submitted', 'vcf_files', 'file2.vcf.tbi'))
+        touch(os.path.join(eload.eload_dir, '10_submitted', 'vcf_files', '.file3.vcf'))
         metadata = os.path.join(eload.eload_dir, '10_submitted', 'metadata_file', 'metadata.xlsx')
         touch(metadata)
 
@@ -57,3 +62,53 @@ class TestEload(TestCase):
         # Check that the metadata spreadsheet is in the config file
         assert eload.eload_cfg.query('submission', 'metadata_spreadsheet') == metadata
 
+    def test_detect_metadata_attributes(self):
+        metadata = os.path.join(self.resources_folder, 'metadata.xlsx')
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        self.eload.eload_cfg.content = {}
+        self.eload.eload_cfg.set('submission', 'metadata_spreadsheet', value=metadata)
+        with patch('eva_submission.eload_submission.retrieve_genbank_assembly_accessions_from_ncbi',
+                   return_value={'GCA_000001405.1'}) as m_retrieve_assembly, \
+                patch('eva_submission.eload_submission.get_scientific_name_from_ensembl',
+                      return_value='Homo sapiens') as m_get_name:
+            self.eload.detect_metadata_attributes()
+        m_retrieve_assembly.assert_called_once_with('GCA_000001405.1')
+        m_get_name.assert_called_once_with(9606)
+        assert self.eload.eload_cfg.query('submission', 'assembly_accession') == 'GCA_000001405.1'
+        assert self.eload.eload_cfg.query('submission', 'taxonomy_id') == 9606
+        assert self.eload.eload_cfg.query('submission', 'scientific_name') == 'Homo sapiens'
+
+    def test_update_metadata_from_config(self):
+        metadata = os.path.join(self.resources_folder, 'metadata.xlsx')
+        output_metadata = os.path.join(self.eload.eload_dir, 'updated_metadata.xlsx')
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        self.eload.eload_cfg.content = {}
+        vcf_file = os.path.join(self.eload.eload_dir, '18_brokering', 'ena', 'T100.vcf.gz')
+        self.eload.eload_cfg.set('brokering', 'Biosamples', 'Samples', value={'S1': 'SAME0001'})
+        self.eload.eload_cfg.set('brokering', 'vcf_files', value={
+            vcf_file: {'original_vcf': 'T100.vcf.gz', 'md5': 'md5vcf', 'index': vcf_file + '.tbi', 'index_md5': 'md5tbi'}
+        })
+        self.eload.update_metadata_from_config(metadata, output_metadata)
+
+        reader = EvaXlsxReader(output_metadata)
+        sample_s1 = [sample for sample in reader.samples if sample.get('Sample ID') == 'S1'][0]
+        assert sample_s1['Sample Accession'] == 'SAME0001'
+        assert [(f['File Name'], f['File Type'], f['MD5']) for f in reader.files] == [
+            ('ELOAD_1/T100.vcf.gz', 'vcf', 'md5vcf'),
+            ('ELOAD_1/T100.vcf.gz.tbi', 'tabix', 'md5tbi')
+        ]
+
+    def test_detect_metadata_attributes_same_reference(self):
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        self.eload.eload_cfg.content = {}
+        self.eload.eload_cfg.set('submission', 'metadata_spreadsheet', value='metadata.xlsx')
+        with patch('eva_submission.eload_submission.EvaXlsxReader') as m_reader, \
+                patch('eva_submission.eload_submission.retrieve_genbank_assembly_accessions_from_ncbi',
+                      return_value={'GCA_000001405.1'}) as m_retrieve_assembly, \
+                patch('eva_submission.eload_submission.get_scientific_name_from_ensembl',
+                      return_value='Homo sapiens'):
+            m_reader.return_value.analysis = [{'Reference': 'GCA_000001405.1'}, {'Reference': 'GCA_000001405.1'}]
+            m_reader.return_value.project = {'Tax ID': 9606}
+            self.eload.detect_metadata_attributes()
+        m_retrieve_assembly.assert_called_once_with('GCA_000001405.1')
+        assert self.eload.eload_cfg.query('submission', 'assembly_accession') == 'GCA_000001405.1'
@@ -0,0 +1,37 @@
+import filecmp
+import os
+import subprocess
+import tempfile
+from unittest import TestCase
+
+from eva_submission import ROOT_DIR
+from eva_submission.eload_utils import run_command_with_output, copy_file
+
+
+class TestEloadUtils(TestCase):
+
+    def test_copy_file(self):
+        source = os.path.join(ROOT_DIR, 'tests', 'resources', 'ftpboxes', 'eva-box-01', 'upload', 'john', 'vcf_file',
+                              'data.vcf.gz')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest = os.path.join(tmp_dir, 'data.vcf.gz')
+            assert copy_file(source, dest) == dest
+            assert filecmp.cmp(source, dest, shallow=False)
+
+    def test_run_command_with_output(self):
+        command = ['sh', '-c', 'echo line1; echo error1 >&2; printf "line2\\nline3"']
+        with self.assertLogs('eva_submission.eload_utils', level='INFO') as logs:
+            run_command_with_output('Test command', command)
+        assert 'INFO:eva_submission.eload_utils:line1' in logs.output
+        assert 'INFO:eva_submission.eload_utils:line2' in logs.output
+        assert 'INFO:eva_submission.eload_utils:line3' in logs.output
+        assert 'ERROR:eva_submission.eload_utils:error1' in logs.output
+
+    def test_run_command_with_output_failure(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            run_command_with_output('Test command', ['sh', '-c', 'exit 2'])
+
+    def test_run_command_with_output_env(self):
+        with self.assertLogs('eva_submission.eload_utils', level='INFO') as logs:
+            run_command_with_output('Test command', ['sh', '-c', 'echo $NXF_OPTS'], env={'NXF_OPTS': '-Xmx8g'})
+        assert 'INFO:eva_submission.eload_utils:-Xmx8g' in logs.output
@@ -1,10 +1,12 @@
 import os
+import shutil
 from unittest import TestCase
 from unittest.mock import patch
 
 from eva_submission import ROOT_DIR
 from eva_submission.eload_validation import EloadValidation
 from eva_submission.submission_config import load_config
+from tests.test_eload_submission import touch
 
 
 class TestEloadValidation(TestCase):
@@ -37,6 +39,88 @@ class TestEloadValidation(TestCase):
         assert nb_error == 8
         assert nb_warning == 1
 
+    def test_validate(self):
+        validation = EloadValidation(3)
+        self.addCleanup(shutil.rmtree, validation.eload_dir)
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        validation.eload_cfg.content = {}
+        output_dir = os.path.join(validation.eload_dir, 'tmp')
+        os.makedirs(output_dir)
+        with patch.object(EloadValidation, '_validate_metadata_format') as m_metadata, \
+                patch.object(EloadValidation, '_validate_sample_names') as m_samples, \
+                patch.object(EloadValidation, '_run_validation_workflow', return_value=output_dir) as m_workflow, \
+                patch.object(EloadValidation, '_collect_validation_worklflow_results') as m_collect:
+            validation.validate()
+        m_metadata.assert_called_once_with()
+        m_samples.assert_called_once_with()
+        m_workflow.assert_called_once_with()
+        m_collect.assert_called_once_with(output_dir)
+        assert not os.path.exists(output_dir)
+
+    def test_validate_failing_check(self):
+        validation = EloadValidation(3)
+        self.addCleanup(shutil.rmtree, validation.eload_dir)
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        validation.eload_cfg.content = {}
+        output_dir = os.path.join(validation.eload_dir, 'tmp')
+        os.makedirs(output_dir)
+        with patch.object(EloadValidation, '_validate_metadata_format', side_effect=ValueError('Invalid metadata')), \
+                patch.object(EloadValidation, '_validate_sample_names'), \
+                patch.object(EloadValidation, '_run_validation_workflow', return_value=output_dir) as m_workflow, \
+                patch.object(EloadValidation, '_collect_validation_worklflow_results') as m_collect:
+            with self.assertRaises(ValueError):
+                validation.validate()
+        m_workflow.assert_called_once_with()
+        # The workflow results are kept despite the failing check
+        m_collect.assert_called_once_with(output_dir)
+        assert not os.path.exists(output_dir)
+
+    def test_validate_failing_collection(self):
+        validation = EloadValidation(3)
+        self.addCleanup(shutil.rmtree, validation.eload_dir)
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        validation.eload_cfg.content = {}
+        output_dir = os.path.join(validation.eload_dir, 'tmp')
+        os.makedirs(output_dir)
+        with patch.object(EloadValidation, '_validate_metadata_format'), \
+                patch.object(EloadValidation, '_validate_sample_names'), \
+                patch.object(EloadValidation, '_run_validation_workflow', return_value=output_dir), \
+                patch.object(EloadValidation, '_collect_validation_worklflow_results', side_effect=OSError()):
+            with self.assertRaises(OSError):
+                validation.validate()
+        # The Nextflow output is only removed once its results have been collected
+        assert os.path.exists(output_dir)
+
+    def test_collect_validation_workflow_results(self):
+        validation = EloadValidation(3)
+        self.addCleanup(shutil.rmtree, validation.eload_dir)
+        # Without a config file on disk the content is shared across instances: use a dedicated one
+        validation.eload_cfg.content = {}
+        output_dir = os.path.join(validation.eload_dir, 'tmp')
+        vcf_format_files = ['test.vcf.vcf_format.log', 'test.vcf.errors.1.txt', 'test.vcf.errors.1.db']
+        assembly_check_files = ['test.vcf.assembly_check.log', 'test.vcf.valid_assembly_report.txt',
+                                'test.vcf.text_assembly_report.txt']
+        for sub_dir, file_names in (('vcf_format', vcf_format_files), ('assembly_check', assembly_check_files)):
+            os.makedirs(os.path.join(output_dir, sub_dir))
+            for file_name in file_names:
+                touch(os.path.join(output_dir, sub_dir, file_name))
+        validation.eload_cfg.set('submission', 'vcf_files', value=['/path/to/test.vcf'])
+
+        validation._collect_validation_worklflow_results(output_dir)
+
+        vcf_check_results = validation.eload_cfg.query('validation', 'vcf_check', 'files', 'test.vcf')
+        assert vcf_check_results['vcf_check_text_report'] == os.path.join(
+            validation._get_dir('vcf_check'), 'test.vcf.vcf_validator.txt'
+        )
+        assert os.path.isfile(vcf_check_results['vcf_check_db_report'])
+        assembly_check_results = validation.eload_cfg.query('validation', 'assembly_check', 'files', 'test.vcf')
+        assert assembly_check_results['assembly_check_text_report'] == os.path.join(
+            validation._get_dir('assembly_check'), 'test.vcf.text_assembly_report.txt'
+        )
+        assert os.path.isfile(assembly_check_results['assembly_check_valid_vcf'])
+        assert os.listdir(os.path.join(output_dir, 'vcf_format')) == []
+        assert os.listdir(os.path.join(output_dir, 'assembly_check')) == []
+
     def test_report(self):
         expected_report = '''Validation performed on 2020-11-01 10:37:54.755607
 Metadata check: PASS
@@ -1,5 +1,6 @@
 import os
 from unittest import TestCase
+from unittest.mock import patch
 
 from eva_submission import ROOT_DIR
 from eva_submission.xlsx.xlsx_validation import EvaXlsxValidator
@@ -38,3 +39,17 @@ class TestEvaXlsValidator(TestCase):
     def test_validate(self):
         self.validator.validate()
         assert self.validator.error_list == []
+
+    def test_semantic_validation(self):
+        with patch('eva_submission.xlsx.xlsx_validation.retrieve_genbank_assembly_accessions_from_ncbi',
+                   return_value=[]) as m_retrieve_assembly, \
+                patch('eva_submission.xlsx.xlsx_validation.get_scientific_name_from_ensembl',
+                      return_value='Equus caballus') as m_get_name:
+            self.validator.semantic_validation()
+        m_retrieve_assembly.assert_called_once_with('GCA_000001405.1')
+        m_get_name.assert_called_once_with(9606)
+        expected_errors = [
+            'In Analysis, Reference GCA_000001405.1 did not resolve to any accession',
+            'In Samples, Taxonomy 9606 and scientific name Homo sapiens are inconsistent'
+        ]
+        self.assertEqual(self.validator.error_list, expected_errors)